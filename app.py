@@ -1,28 +1,106 @@
 import dash
-from dash import dcc, html, Input, Output, State, dash_table
+from dash import dcc, html, Input, Output, State, MATCH, dash_table
+from dash.dash_table.Format import Format, Scheme, Trim
 import dash_bootstrap_components as dbc
+from flask_caching import Cache
 import pandas as pd
+from openpyxl import load_workbook
+import hashlib
+import inspect
+import json
 import os
 
-# Load the Excel file
+# Function to write a file through a temporary sibling and os.replace, so readers never see it half written
+def write_atomically(path, write):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    write(tmp)
+    os.replace(tmp, path)
+
+# Function to write a JSON file atomically
+def write_json(path, obj):
+    def dump(tmp):
+        with open(tmp, 'w') as f:
+            json.dump(obj, f)
+    write_atomically(path, dump)
+
+# Function to stream every sheet of a workbook into DataFrames using openpyxl's read-only mode
+def read_workbook(path):
+    wb = load_workbook(path, read_only=True, data_only=True)  # Stream cells instead of building the full sheet in memory
+    try:
+        frames = {}
+        for ws in wb.worksheets:
+            # iter_rows pads every row to the sheet's declared dimension; trim trailing empty cells and rows as read_excel does
+            rows = []
+            for row in ws.iter_rows(values_only=True):
+                end = len(row)
+                while end and row[end - 1] is None:
+                    end -= 1
+                rows.append(row[:end])
+            while rows and not rows[-1]:
+                rows.pop()
+            width = max(map(len, rows), default=0)
+            rows = [row + (None,) * (width - len(row)) for row in rows]
+            header, rows = (rows[0], rows[1:]) if rows else ((), [])
+            columns = []
+            for i, name in enumerate(header):
+                base = name = f"Unnamed: {i}" if name is None else str(name)  # Match read_excel's names for blank headers
+                dup = 0
+                while name in columns:
+                    dup += 1
+                    name = f"{base}.{dup}"  # Keep duplicate headers unique, as read_excel does
+                columns.append(name)
+            frames[ws.title] = pd.DataFrame(rows, columns=columns)
+        return frames
+    finally:
+        wb.close()  # Read-only workbooks keep the file handle open until closed
+
+# Function to load the workbook's sheets, reusing a Parquet copy until the Excel file or the loading code changes
+def load_sheets(path, cache_dir='.cache'):
+    manifest = os.path.join(cache_dir, 'sheets.json')
+    version = hashlib.md5((inspect.getsource(read_workbook) + inspect.getsource(load_sheets)).encode(), usedforsecurity=False).hexdigest()[:8]
+    if os.path.exists(manifest) and os.path.getmtime(manifest) >= os.path.getmtime(path):
+        try:
+            with open(manifest) as f:
+                cached = json.load(f)
+        except ValueError:
+            cached = None
+        if isinstance(cached, dict) and cached.get('version') == version:
+            return {name: pd.read_parquet(os.path.join(cache_dir, f"{i}.parquet")) for i, name in enumerate(cached['sheets'])}
+    frames = {}
+    os.makedirs(cache_dir, exist_ok=True)
+    for i, (name, df) in enumerate(read_workbook(path).items()):
+        df = df.astype({col: 'string' for col in df.select_dtypes(include='object').columns})  # Parquet needs one type per column
+        write_atomically(os.path.join(cache_dir, f"{i}.parquet"), df.to_parquet)
+        frames[name] = df
+    write_json(manifest, {'version': version, 'sheets': list(frames)})  # Written last so a partially written cache is never picked up
+    return frames
+
+# Load every sheet of the Excel file once and keep the DataFrames cached at module level
 file_path = 'data.xlsx'
-excel_data = pd.ExcelFile(file_path)
+sheets = load_sheets(file_path)
+sheet_names = list(sheets)
 
-# Function to format data to three significant figures and drop NaN columns and rows
+# Three significant figures, applied by the DataTable in the browser
+number_format = Format(precision=3, scheme=Scheme.decimal_or_exponent).trim(Trim.yes)  # Drop trailing zeros like '{:.3g}'
+
+# Function to drop NaN columns and rows; numeric columns keep their dtype so the table can format and sort them
 def format_data(df):
-    df = df.dropna(axis=1, how='all')  # Drop columns with all NaN values
-    df = df.dropna(axis=0, how='all')  # Drop rows with all NaN values
-    for col in df.select_dtypes(include=['float', 'int']).columns:
-        df[col] = df[col].apply(lambda x: '{:.3g}'.format(x) if pd.notna(x) else '')  # Format numbers and replace NaN with empty string
-    df = df.fillna('')  # Replace any remaining NaN values with an empty string
+    mask = df.notna().to_numpy()
+    df = df.iloc[mask.any(axis=1), mask.any(axis=0)]  # Drop rows and columns with all NaN values in one pass
+    num_cols = df.select_dtypes(include=['float', 'int']).columns
+    df = df.fillna({col: '' for col in df.columns.difference(num_cols)})  # Replace NaN in text columns with an empty string
     return df
 
 # Function to create a DataTable from a DataFrame
 def create_table(df):
     df = format_data(df)
+    num_cols = set(df.select_dtypes(include=['float', 'int']).columns)
+    cols = df.columns.tolist()
+    values = [df[col].tolist() for col in cols]  # Extract each column in one C-level pass
     return dash_table.DataTable(
-        columns=[{"name": i, "id": i} for i in df.columns],
-        data=df.to_dict('records'),
+        columns=[{"name": i, "id": i, "type": "numeric", "format": number_format} if i in num_cols else {"name": i, "id": i}
+                 for i in df.columns],
+        data=[dict(zip(cols, row)) for row in zip(*values)],
         style_table={'overflowX': 'auto'},
         style_cell={
             'height': 'auto',
@@ -43,16 +121,18 @@ def create_table(df):
 
 # Create the app with Bootstrap theme
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
+app.server.config.update(SEND_FILE_MAX_AGE_DEFAULT=31536000)  # Let browsers cache assets for a year; image URLs carry a content hash
 
-# Generate tabs with DataTables for each sheet
-tabs = []
-for sheet_name in excel_data.sheet_names:
-    df = pd.read_excel(file_path, sheet_name=sheet_name)
-    tabs.append(
-        dbc.Tab(label=sheet_name, tab_id=sheet_name, children=[
-            html.Div(create_table(df))
-        ])
-    )
+# In-process cache for built components; the workbook is static, so entries never expire
+cache = Cache(app.server, config={'CACHE_TYPE': 'SimpleCache', 'CACHE_DEFAULT_TIMEOUT': 0})
+
+# Function to build the DataTable for a sheet once and serve it from the cache afterwards
+@cache.memoize()
+def create_sheet_table(sheet_name):
+    return create_table(sheets[sheet_name])
+
+# Generate one empty tab per sheet; the selected sheet's DataTable is rendered on demand into tab-content
+tabs = [dbc.Tab(label=sheet_name, tab_id=sheet_name) for sheet_name in sheet_names]
 
 # Create cards to display images
 def create_image_card(image_path, index):
@@ -60,7 +140,7 @@ def create_image_card(image_path, index):
         [
             html.Div(
                 dbc.CardImg(src=image_path, top=True, style={'height': '300px', 'objectFit': 'contain', 'cursor': 'pointer'}),
-                id=f"image-{index}", n_clicks=0
+                id={'type': 'image-trigger', 'index': index}, n_clicks=0
             )
         ],
         style={'margin': '10px', 'border': 'none'}
@@ -85,8 +165,34 @@ navbar = dbc.Navbar(
     className="mb-4"
 )
 
+# Function to get a short content hash of a file, used to bust browser caches when an image changes
+def content_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.md5(f.read(), usedforsecurity=False).hexdigest()[:8]
+
+# Function to list the gallery images, reusing saved hashes for files whose mtime and size are unchanged
+def list_images(directory='assets/images', index_file='.image_index.json'):
+    try:
+        with open(index_file) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}  # Missing or unreadable index; rehash everything
+    files = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.png'):
+                continue
+            stat = entry.stat()
+            mtime, size, digest = index.get(entry.name, (None, None, None))
+            if (mtime, size) != (stat.st_mtime, stat.st_size):
+                digest = content_hash(entry.path)  # New or edited in place, so the URL must change
+            files[entry.name] = [stat.st_mtime, stat.st_size, digest]
+    if files != index:
+        write_json(index_file, files)
+    return tuple(f"/{directory}/{name}?v={digest}" for name, (_, _, digest) in files.items())
+
 # Image gallery
-image_paths = [f"/assets/images/{img}" for img in os.listdir('assets/images') if img.endswith('.png')]
+image_paths = list_images()
 image_gallery = dbc.Container(
     dbc.Row(
         [dbc.Col(create_image_card(image_path, index), width=4) for index, image_path in enumerate(image_paths)],
@@ -101,10 +207,10 @@ modals = [dbc.Modal(
         dbc.ModalHeader(dbc.ModalTitle(f"Image {index+1}")),
         dbc.ModalBody(html.Img(src=image_path, style={'width': '100%'})),
         dbc.ModalFooter(
-            dbc.Button("Close", id=f"close-{index}", className="ms-auto", n_clicks=0)
+            dbc.Button("Close", id={'type': 'close', 'index': index}, className="ms-auto", n_clicks=0)
         ),
     ],
-    id=f"modal-{index}",
+    id={'type': 'modal', 'index': index},
     is_open=False,
     size="xl",
 ) for index, image_path in enumerate(image_paths)]
@@ -112,24 +218,34 @@ modals = [dbc.Modal(
 # Layout of the app
 app.layout = dbc.Container([
     navbar,
-    dbc.Tabs(id="tabs", active_tab=excel_data.sheet_names[0], children=tabs, className="mt-4"),
+    dbc.Tabs(id="tabs", active_tab=sheet_names[0], children=tabs, className="mt-4"),
+    html.Div(id="tab-content"),
     html.Hr(),
     html.H2("Image Gallery", style={'text-align': 'center', 'color': 'white'}),
     image_gallery,
     *modals
 ], fluid=True, style={'backgroundColor': 'black'})
 
-# Callbacks for opening and closing modals
-for index in range(len(image_paths)):
-    @app.callback(
-        Output(f"modal-{index}", "is_open"),
-        [Input(f"image-{index}", "n_clicks"), Input(f"close-{index}", "n_clicks")],
-        [State(f"modal-{index}", "is_open")]
-    )
-    def toggle_modal(n1, n2, is_open):
-        if n1 or n2:
-            return not is_open
-        return is_open
+# Callback to render the DataTable of the selected sheet only
+@app.callback(
+    Output("tab-content", "children"),
+    Input("tabs", "active_tab")
+)
+def render_tab(active_tab):
+    return create_sheet_table(active_tab)
+
+# Single pattern-matching callback for opening and closing every modal, run in the browser to skip the server round-trip
+app.clientside_callback(
+    """
+    function(n1, n2, is_open) {
+        return (n1 || n2) ? !is_open : is_open;
+    }
+    """,
+    Output({'type': 'modal', 'index': MATCH}, "is_open"),
+    [Input({'type': 'image-trigger', 'index': MATCH}, "n_clicks"), Input({'type': 'close', 'index': MATCH}, "n_clicks")],
+    [State({'type': 'modal', 'index': MATCH}, "is_open")],
+    prevent_initial_call=True
+)
 
 if __name__ == '__main__':
     app.run_server(debug=True)
@@ -0,0 +1,12 @@
+# Import necessary libraries
+from numba.pycc import CC
+import kernel
+
+# Compile the performance kernel ahead of time into an aero_kernel_<hash> extension module,
+# so main.py can import it without paying Numba's JIT compile on startup or first click.
+# The hash ties the build to the current kernel.py; after any change, rerun this script.
+cc = CC(f'aero_kernel_{kernel.BUILD_HASH}')
+cc.export('calc', kernel.SIGNATURE)(kernel.calculate_values)
+
+if __name__ == '__main__':
+    cc.compile()
@@ -0,0 +1,29 @@
+# Import necessary libraries
+import hashlib
+import numpy as np
+
+# Numba signature shared by the JIT build in main.py and the ahead-of-time build in build_kernel.py
+SIGNATURE = 'UniTuple(float64[:, :], 3)(float64[:], float64[:], float64[:], float64, float64, float64, float64, float64, float64[:], float64[:], float64, float64, float64)'
+
+# Hash of this file (which holds the kernel and its signature); build_kernel.py puts it in the extension's
+# module name, so main.py never loads an ahead-of-time build of an older kernel
+with open(__file__, 'rb') as f:
+    BUILD_HASH = hashlib.md5(f.read() + SIGNATURE.encode(), usedforsecurity=False).hexdigest()[:8]
+
+# Function to calculate velocity, rate of climb and climb angle for every air density at once.
+# Densities are broadcast against c_l, so each result is a (len(density), len(c_l)) array with one row per altitude.
+def calculate_values(c_l2, sqrt_c_l, c_l15, c_d0, e0, AR, w, area, density, density_ratio, rpm, prop_diameter, bhp):
+    rho = density[:, np.newaxis]  # Column vectors so per-altitude terms broadcast across c_l
+    sigma = density_ratio[:, np.newaxis]
+    c_d = c_d0 + (c_l2 / (3.14 * e0 * AR))
+    v = np.sqrt(w / (0.5 * rho * area)) * (1 / sqrt_c_l)
+    J = v / ((rpm / 60) * prop_diameter)
+    prop_efficiency = (((-12.06 * J + 27.19) * J - 23.08) * J + 9.281) * J - 0.8122  # Horner form of the quartic fit
+    p_req = w * np.sqrt(2 * w / (area * rho)) * (c_d / c_l15)
+    shp = bhp * sigma
+    p_av = shp * prop_efficiency
+    roc = (p_av - p_req) / w
+    climb_angle = roc / v
+    np.clip(climb_angle, -1.0, 1.0, climb_angle)  # Keep arcsin in its domain, reusing the same buffer
+    np.arcsin(climb_angle, climb_angle)
+    return v, roc, climb_angle
@@ -2,13 +2,65 @@
 import dash
 from dash import dcc, html
 from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
 import numpy as np
 import plotly.graph_objs as go
 from scipy.optimize import fsolve
+from flask_caching import Cache
+import hashlib
+import importlib
+import kernel
+
+# Lift coefficient range and the powers of it used by the kernel; none depend on user input
+_CL = np.linspace(0, 1.3182, 20)
+_CL2 = _CL**2
+_SQRTCL = np.sqrt(_CL)
+_CL15 = _CL * _SQRTCL
+
+# Air densities and density ratios for the analysed altitudes
+_DENSITIES = np.array([2.377e-3, 2.048e-3, 1.756e-3, 1.496e-3])
+_RATIOS = np.array([1.0, 0.86159, 0.738746, 0.62936])
+_ALTS = (0, 5000, 10000, 15000)
+
+# Dark-theme layout shared by every figure; each figure only adds its own titles
+_BASE_LAYOUT = go.Layout(
+    margin={'l': 40, 'b': 40, 't': 40, 'r': 40},
+    paper_bgcolor='#1f1f1f',
+    plot_bgcolor='#1f1f1f',
+    font={'color': 'white'}
+).to_plotly_json()
+
+# Function to build a figure layout on top of the shared base
+def figure_layout(title, xaxis_title, yaxis_title):
+    return {
+        **_BASE_LAYOUT,
+        'title': {'text': title},
+        'xaxis': {'title': {'text': xaxis_title}, 'color': 'white'},
+        'yaxis': {'title': {'text': yaxis_title}, 'color': 'white'},
+    }
+
+# Use the ahead-of-time build of the current kernel when present (see build_kernel.py); a build of an
+# older kernel.py has a different module name and is ignored. Otherwise JIT-compile it with Numba at import
+# so the first Calculate click doesn't pay the compile cost, or run it as plain NumPy when Numba is not installed either
+try:
+    calculate_values = importlib.import_module(f'aero_kernel_{kernel.BUILD_HASH}').calc
+except ImportError:
+    try:
+        from numba import njit
+        calculate_values = njit(kernel.SIGNATURE, cache=True, error_model='numpy')(kernel.calculate_values)
+    except ImportError:
+        calculate_values = kernel.calculate_values
 
 # Initialize the Dash app
 app = dash.Dash(__name__)
 
+# Disk-backed cache for computed figures, shared across worker processes
+cache = Cache(app.server, config={'CACHE_TYPE': 'FileSystemCache', 'CACHE_DIR': '.dash-cache', 'CACHE_DEFAULT_TIMEOUT': 3600})
+
+# Hash of the kernel build and this file's figure code; part of the cache key so a changed kernel or layout never serves old figures
+with open(__file__, 'rb') as f:
+    figures_version = hashlib.md5(kernel.BUILD_HASH.encode() + f.read(), usedforsecurity=False).hexdigest()[:8]
+
 # Define the layout of the app
 app.layout = html.Div(
     style={'backgroundColor': '#1f1f1f', 'color': 'white', 'fontFamily': 'Arial, sans-serif'},
@@ -77,6 +129,43 @@ app.layout = html.Div(
     ]
 )
 
+# Function to calculate the rate-of-climb and climb-angle figures for a set of aircraft parameters.
+# Results are memoized on the parameters, so repeated Calculate clicks with unchanged inputs skip the work.
+@cache.memoize(make_name=lambda fname: f"{fname}-{figures_version}")
+def compute_figures(c_d0, AR, e0, w, bhp, area, prop_diameter, rpm):
+    # Convert bhp to watts (1 hp = 550 watts)
+    bhp *= 550
+
+    # Calculate values for all specified altitudes in one vectorized pass
+    vs, rocs, climb_angles = calculate_values(_CL2, _SQRTCL, _CL15, c_d0, e0, AR, w, area, _DENSITIES, _RATIOS, rpm, prop_diameter, bhp)
+
+    # List to store figures as plain dicts alongside their graph ids
+    figures = []
+
+    # Generate figures for each altitude
+    for i, (altitude, v, roc, climb_angle) in enumerate(zip(_ALTS, vs, rocs, climb_angles)):
+        figures.append({
+            'id': f'roc-plot-{i}',
+            'figure': {
+                'data': [
+                    go.Scatter(x=v, y=roc, mode='lines', name=f'Rate of Climb at {altitude} ft', line=dict(color='#6a0dad')).to_plotly_json()
+                ],
+                'layout': figure_layout(f'Rate of Climb at {altitude} ft', 'Velocity (ft/s)', 'Rate of Climb (ft/s)')
+            }
+        })
+        figures.append({
+            'id': f'climb-angle-plot-{i}',
+            'figure': {
+                'data': [
+                    go.Scatter(x=v, y=climb_angle, mode='lines', name=f'Climb Angle at {altitude} ft', line=dict(color='#ff69b4')).to_plotly_json()
+                ],
+                'layout': figure_layout(f'Climb Angle at {altitude} ft', 'Velocity (ft/s)', 'Climb Angle (radians)')
+            }
+        })
+
+    # Return the generated figures
+    return figures
+
 # Callback function to update the output based on input parameters
 @app.callback(
     Output('output-div', 'children'),
@@ -89,85 +178,14 @@ app.layout = html.Div(
     State('area', 'value'),
     State('prop_diameter', 'value'),
     State('rpm', 'value'),
+    prevent_initial_call=True
 )
 def update_output(n_clicks, c_d0, AR, e0, w, bhp, area, prop_diameter, rpm):
-    if n_clicks == 0:
-        return ''
-    
-    # Constants for air density at different altitudes
-    density = 2.377 * 10**-3
-    density_5000ft = 2.048 * 10**-3
-    density_10000ft = 1.756 * 10**-3
-    density_15000ft = 1.496 * 10**-3
-    density_ratios = [1, 0.86159, 0.738746, 0.62936]
-    
-    # Lift coefficient range
-    c_l = np.linspace(0, 1.3182, 20)
-    # Convert bhp to watts (1 hp = 550 watts)
-    bhp *= 550
-    # Air densities for different altitudes
-    rpms = [density, density_5000ft, density_10000ft, density_15000ft]
-
-    # Function to calculate values for a given air density
-    def calculate_values(density, density_ratio):
-        c_d = c_d0 + (c_l**2 / (3.14 * e0 * AR))
-        v = np.sqrt(w / (0.5 * density * area)) * (1 / np.sqrt(c_l))
-        d = 0.5 * density * area * v**2
-        J = v / ((rpm / 60) * prop_diameter)
-        prop_efficiency = -12.06 * J**4 + 27.19 * J**3 - 23.08 * J**2 + 9.281 * J - 0.8122
-        p_req = w * np.sqrt(2 * w / (area * density)) * (c_d / c_l**1.5)
-        shp = bhp * density_ratio
-        p_av = shp * prop_efficiency
-        roc = (p_av - p_req) / w
-        climb_angle = np.arcsin(roc / v)
-        return v, roc, climb_angle
-
-    # Calculate values for all specified altitudes
-    results = [calculate_values(density, ratio) for density, ratio in zip(rpms, density_ratios)]
-
-    # List to store plots
-    plots = []
-
-    # Generate plots for each altitude
-    for i, (altitude, density_ratio, (v, roc, climb_angle)) in enumerate(zip([0, 5000, 10000, 15000], density_ratios, results)):
-        plots.append(
-            dcc.Graph(
-                id=f'roc-plot-{i}',
-                figure={
-                    'data': [
-                        go.Scatter(x=v, y=roc, mode='lines', name=f'Rate of Climb at {altitude} ft', line=dict(color='#6a0dad'))
-                    ],
-                    'layout': go.Layout(
-                        title=f'Rate of Climb at {altitude} ft',
-                        xaxis={'title': 'Velocity (ft/s)', 'color': 'white'},
-                        yaxis={'title': 'Rate of Climb (ft/s)', 'color': 'white'},
-                        margin={'l': 40, 'b': 40, 't': 40, 'r': 40},
-                        paper_bgcolor='#1f1f1f',
-                        plot_bgcolor='#1f1f1f',
-                        font={'color': 'white'}
-                    )
-                }
-            )
-        )
-        plots.append(
-            dcc.Graph(
-                id=f'climb-angle-plot-{i}',
-                figure={
-                    'data': [
-                        go.Scatter(x=v, y=climb_angle, mode='lines', name=f'Climb Angle at {altitude} ft', line=dict(color='#ff69b4'))
-                    ],
-                    'layout': go.Layout(
-                        title=f'Climb Angle at {altitude} ft',
-                        xaxis={'title': 'Velocity (ft/s)', 'color': 'white'},
-                        yaxis={'title': 'Climb Angle (radians)', 'color': 'white'},
-                        margin={'l': 40, 'b': 40, 't': 40, 'r': 40},
-                        paper_bgcolor='#1f1f1f',
-                        plot_bgcolor='#1f1f1f',
-                        font={'color': 'white'}
-                    )
-                }
-            )
-        )
+    if not n_clicks:
+        raise PreventUpdate  # Leave the output untouched until Calculate is pressed
+
+    # Wrap the (possibly cached) figures in graphs
+    plots = [dcc.Graph(id=f['id'], figure=f['figure']) for f in compute_figures(c_d0, AR, e0, w, bhp, area, prop_diameter, rpm)]
 
     # Return the generated plots
     return html.Div(plots)